@@ -8,28 +8,26 @@ import logging
 # Setup logging and environment
 logging.basicConfig(level=logging.INFO)
 
-# Update statistics in the database
-async def update_stats(user_id, server_id, games_played=0, games_won=0, guess_number=None, time_taken=None, won=False):
-    # Fetch the current stats for the user
-    response = supabase.table("user_stats").select("*").eq("user_id", user_id).eq("server_id", server_id).execute()
-    row = response.data[0] if response.data else None
+def _empty_stats_row():
+    return {
+        "games_played": 0,
+        "games_won": 0,
+        "fastest_time": 0,
+        "average_time": 0,
+        "guess_distribution": {},
+        "current_streak": 0,
+        "max_streak": 0
+    }
 
-    if row:
-        current_games_played = row["games_played"]
-        current_games_won = row["games_won"]
-        current_fastest_time = row["fastest_time"]
-        current_average_time = row["average_time"]
-        guess_distribution = row["guess_distribution"] or {}
-        current_streak = row["current_streak"]
-        max_streak = row["max_streak"]
-    else:
-        current_games_played = 0
-        current_games_won = 0
-        current_fastest_time = 0
-        current_average_time = 0
-        guess_distribution = {}
-        current_streak = 0
-        max_streak = 0
+def _apply_result(row, user_id, server_id, games_played=0, games_won=0, guess_number=None, time_taken=None, won=False):
+    # Build the updated user_stats row for one game result
+    current_games_played = row["games_played"]
+    current_games_won = row["games_won"]
+    current_fastest_time = row["fastest_time"]
+    current_average_time = row["average_time"]
+    guess_distribution = dict(row["guess_distribution"] or {})
+    current_streak = row["current_streak"]
+    max_streak = row["max_streak"]
 
     # Update the guess distribution
     if guess_number is not None:
@@ -40,33 +38,6 @@ async def update_stats(user_id, server_id, games_played=0, games_won=0, guess_nu
         if current_fastest_time == 0 or time_taken < current_fastest_time:
             current_fastest_time = time_taken
 
-        # Insert the solve time into the fastest_solves table
-        supabase.table("fastest_solves").insert({
-            "user_id": user_id,
-            "server_id": server_id,
-            "solve_time": time_taken
-        }).execute()
-
-        # Fetch the top 10 fastest solves for this user in this server
-        response = (
-            supabase.table("fastest_solves")
-            .select("*")
-            .eq("server_id", server_id)
-            #.order([{ column: 'solve_time', order: 'asc' }])
-            .execute() )
-        
-
-        fastest_solves = response.data if response.data else []
-        logging.info(f"Fastest solves: {len(fastest_solves)}")
-        
-        # Sort the list by solve_time in ascending order
-        sorted_solves = sorted(fastest_solves, key=lambda x: x["solve_time"])
-
-        # Delete any solves beyond the top 10
-        if len(sorted_solves) > 10:
-            to_delete_ids = [solve["id"] for solve in sorted_solves[10:]]
-            supabase.table("fastest_solves").delete().in_("id", to_delete_ids).execute()
-
     # Update average time
     if time_taken is not None:
         total_time = (current_average_time * current_games_won) + time_taken
@@ -81,8 +52,7 @@ async def update_stats(user_id, server_id, games_played=0, games_won=0, guess_nu
     else:
         current_streak = 0
 
-    # Upsert the data into Supabase
-    supabase.table("user_stats").upsert({
+    return {
         "user_id": user_id,
         "server_id": server_id,
         "games_played": current_games_played,
@@ -92,7 +62,74 @@ async def update_stats(user_id, server_id, games_played=0, games_won=0, guess_nu
         "guess_distribution": guess_distribution,
         "current_streak": current_streak,
         "max_streak": max_streak
-    }).execute()
+    }
+
+def _trim_fastest_solves(server_id):
+    # Fetch the top 10 fastest solves for this user in this server
+    response = (
+        supabase.table("fastest_solves")
+        .select("*")
+        .eq("server_id", server_id)
+        #.order([{ column: 'solve_time', order: 'asc' }])
+        .execute() )
+    
+
+    fastest_solves = response.data if response.data else []
+    logging.info(f"Fastest solves: {len(fastest_solves)}")
+    
+    # Sort the list by solve_time in ascending order
+    sorted_solves = sorted(fastest_solves, key=lambda x: x["solve_time"])
+
+    # Delete any solves beyond the top 10
+    if len(sorted_solves) > 10:
+        to_delete_ids = [solve["id"] for solve in sorted_solves[10:]]
+        supabase.table("fastest_solves").delete().in_("id", to_delete_ids).execute()
+
+# Update statistics in the database
+async def update_stats(user_id, server_id, games_played=0, games_won=0, guess_number=None, time_taken=None, won=False):
+    # Fetch the current stats for the user
+    response = supabase.table("user_stats").select("*").eq("user_id", user_id).eq("server_id", server_id).execute()
+    row = response.data[0] if response.data else _empty_stats_row()
+
+    if time_taken is not None:
+        # Insert the solve time into the fastest_solves table
+        supabase.table("fastest_solves").insert({
+            "user_id": user_id,
+            "server_id": server_id,
+            "solve_time": time_taken
+        }).execute()
+        _trim_fastest_solves(server_id)
+
+    # Upsert the data into Supabase
+    supabase.table("user_stats").upsert(
+        _apply_result(row, user_id, server_id, games_played, games_won, guess_number, time_taken, won)
+    ).execute()
+
+# Update statistics for many players of one server with a single read and write
+async def update_stats_batch(server_id, results):
+    """
+    results: list of dicts with user_id and the keyword arguments of update_stats.
+    """
+    if not results:
+        return
+    user_ids = [result["user_id"] for result in results]
+    response = supabase.table("user_stats").select("*").eq("server_id", server_id).in_("user_id", user_ids).execute()
+    rows = {row["user_id"]: row for row in (response.data or [])}
+
+    upserts = []
+    solves = []
+    for result in results:
+        result = dict(result)
+        user_id = result.pop("user_id")
+        upserts.append(_apply_result(rows.get(user_id, _empty_stats_row()), user_id, server_id, **result))
+        if result.get("time_taken") is not None:
+            solves.append({"user_id": user_id, "server_id": server_id, "solve_time": result["time_taken"]})
+
+    if solves:
+        supabase.table("fastest_solves").insert(solves).execute()
+        _trim_fastest_solves(server_id)
+
+    supabase.table("user_stats").upsert(upserts).execute()
 
         
 async def update_games_played(user_id, server_id, games_played=1):
@@ -5,36 +5,57 @@ Created on Sat Apr 12 18:10:17 2025
 @author: rhybiq
 """
 
+import time
+
+STARTUP_TIME = time.perf_counter()  # Measured before the heavy imports below
+
 import discord
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
 from datetime import datetime
 from wordle import WordleGame
-from nltk.corpus import words
 from keep_alive import keep_alive
 import logging
 import asyncio
 import os
-import nltk
-import Stats as stats  # Import the Stats module
-import matplotlib.pyplot as plt
 import io
-import matplotlib.patches as patches
+import Stats as stats  # Import the Stats module
+import charts
+from shards import ShardRouter
+from events import EventLog, StatsAggregator
+from race import RaceSession
 from words import fetch_word_meaning 
-from words import get_words_list # Import the function to fetch word meaning
+from words import get_resources, warm_up # Per-length word index and caches
 
 # Setup logging and environment
 logging.basicConfig(level=logging.INFO)
 
 load_dotenv()
 TOKEN = os.getenv('DISCORD_TOKEN')
+# Seconds allowed from process start to on_ready before a warning is logged
+STARTUP_BUDGET = float(os.getenv('STARTUP_BUDGET', '10'))
+# When set, the bot reports its startup time and exits once ready (see startup_bench.py)
+STARTUP_BENCH = os.getenv('STARTUP_BENCH') == '1'
+# Sharding: leave unset to let Discord pick the shard count. For multiprocess
+# sharding, run one process per group of shards with SHARD_COUNT and SHARD_IDS=0,1,...
+SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS').split(',')] if os.getenv('SHARD_IDS') else None
+if SHARD_IDS is not None and SHARD_COUNT is None:
+    raise RuntimeError("SHARD_IDS requires SHARD_COUNT to be set")
 
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix='/', intents=intents)
-games = {}  # Keeps track of active games per user
+bot = commands.AutoShardedBot(command_prefix='/', intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+# Keeps track of active games and caches per shard, using the shard count the bot is running with
+router = ShardRouter(lambda: bot.shard_count, SHARD_IDS)
+# Each shard process writes its own event log segments
+event_log = EventLog(prefix="shard-" + "-".join(map(str, SHARD_IDS)) if SHARD_IDS else "events")
+# Replays the event log, reading only new events each time, for the trend panel of stats charts
+trend_stats = StatsAggregator()
+trend_lock = asyncio.Lock()
+first_ready = True
 
 
 async def heartbeat():
@@ -45,6 +66,12 @@ async def heartbeat():
 # Initialize the database
 @bot.event
 async def on_ready():
+    # on_ready fires again after every reconnect; startup work only runs the first time
+    global first_ready
+    if not first_ready:
+        return
+    first_ready = False
+
     bot.loop.create_task(heartbeat())
    
     print(f'{bot.user} has connected to Discord!')
@@ -56,6 +83,20 @@ async def on_ready():
     except Exception as e:
         print(f"Failed to sync commands: {e}")
 
+    startup_seconds = time.perf_counter() - STARTUP_TIME
+    if startup_seconds > STARTUP_BUDGET:
+        logging.warning(f"Startup took {startup_seconds:.2f}s, over the {STARTUP_BUDGET:.2f}s budget")
+    else:
+        logging.info(f"Startup took {startup_seconds:.2f}s")
+
+    if STARTUP_BENCH:
+        print(f"STARTUP_READY {startup_seconds:.3f}")
+        await bot.close()
+        return
+
+    # Build the popular word lengths in the background so the first game doesn't pay for it
+    bot.loop.create_task(asyncio.to_thread(warm_up))
+
 # Command: Start Wordle
 @bot.tree.command(name="startwordle", description="Start a Wordle game with a specified word length.")
 async def start_wordle(interaction: discord.Interaction, length: int = 5):
@@ -66,17 +107,19 @@ async def start_wordle(interaction: discord.Interaction, length: int = 5):
             await interaction.followup.send("Please choose a word length between 5 and 13.")
             return
 
-        # Fetch the list of words with the specified length
-        filtered_words = get_words_list(length)
-        if not filtered_words:
+        # Fetch the words with the specified length, built off the event loop on first use
+        resources = await asyncio.to_thread(get_resources, length)
+        if not resources.words:
             await interaction.followup.send(f"No words found with length {length}. Try a different number.",ephemeral=True)
             return
 
         # Initialize the game for the user
+        games = router.state_for(interaction.guild_id).games
         games[interaction.user.id] = {
-            "game": WordleGame(filtered_words, word_length=length),
+            "game": WordleGame(resources.words, word_length=length, valid_words=resources.valid_words),
             "start_time": datetime.now()
         }
+        event_log.log_start(interaction.user.id, interaction.guild.id, length)
 
         # Update games played in the database
         await stats.update_games_played(
@@ -100,6 +143,8 @@ async def guess_word(interaction: discord.Interaction, guess: str):
         
 
         # Check if the user has an active game
+        state = router.state_for(interaction.guild_id)
+        games = state.games
         if interaction.user.id not in games:
             await interaction.response.send_message("You don't have an active game. Start one with `/startwordle`.", ephemeral=True)
             return
@@ -111,11 +156,17 @@ async def guess_word(interaction: discord.Interaction, guess: str):
         # Process the guess
         result = game.guess(guess)
         logging.info(f"Result: {result}")
+        if not game.is_error():
+            event_log.log_guess(interaction.user.id, interaction.guild.id, *game.history[-1])
 
         if game.is_solved():
             await interaction.response.defer()
             elapsed_time = datetime.now() - start_time
             minutes, seconds = divmod(elapsed_time.total_seconds(), 60)
+            event_log.log_finish(
+                interaction.user.id, interaction.guild.id, game.word_length,
+                won=True, guesses=len(game.history), seconds=int(elapsed_time.total_seconds())
+            )
 
             # Fetch the word's meaning
             word_meaning = fetch_word_meaning(game.get_secret_word())
@@ -130,6 +181,7 @@ async def guess_word(interaction: discord.Interaction, guess: str):
                     time_taken=int(elapsed_time.total_seconds()),
                     won=True
                 )
+                state.invalidate_leaderboards(str(interaction.guild.id))
 
             await interaction.followup.send(
                 f"{result}\n🎉 Congratulations, you solved it in {int(minutes)} minutes and {int(seconds)} seconds!\n\n"
@@ -139,6 +191,11 @@ async def guess_word(interaction: discord.Interaction, guess: str):
         elif game.remaining_guesses == 0:
             # Fetch the word's meaning
             await interaction.response.defer()
+            event_log.log_finish(
+                interaction.user.id, interaction.guild.id, game.word_length,
+                won=False, guesses=len(game.history),
+                seconds=int((datetime.now() - start_time).total_seconds())
+            )
             word_meaning = fetch_word_meaning(game.get_secret_word())
 
             # Update stats only if the word length is 5
@@ -148,6 +205,7 @@ async def guess_word(interaction: discord.Interaction, guess: str):
                     server_id=str(interaction.guild.id),
                     won=False
                 )
+                state.invalidate_leaderboards(str(interaction.guild.id))
 
             await interaction.followup.send(
                 f"{result}\n😢 Better luck next time! The word was **{game.get_secret_word()}**.\n\n"
@@ -164,9 +222,110 @@ async def guess_word(interaction: discord.Interaction, guess: str):
         logging.error(f"Error in /guessword: {e}")
         await interaction.response.send_message("An error occurred while processing your guess. Please try again later.")
 
+# Command: Start a Race
+@bot.tree.command(name="wordlerace", description="Start a Wordle race where everyone in this channel guesses the same word.")
+@app_commands.describe(length="Word length (5-13)", duration="Race duration in seconds (30-900)")
+async def wordle_race(interaction: discord.Interaction, length: int = 5, duration: int = 120):
+    try:
+        # Only the starter sees these replies; everyone sees the race message posted to the channel
+        await interaction.response.defer(ephemeral=True)
+
+        if length < 5 or length > 13:
+            await interaction.followup.send("Please choose a word length between 5 and 13.")
+            return
+        if duration < 30 or duration > 900:
+            await interaction.followup.send("Please choose a race duration between 30 and 900 seconds.")
+            return
+
+        state = router.state_for(interaction.guild_id)
+        if interaction.channel_id in state.races:
+            await interaction.followup.send("A race is already running in this channel. Join it with `/raceguess yourword`.")
+            return
+
+        resources = await asyncio.to_thread(get_resources, length)
+        if not resources.words:
+            await interaction.followup.send(f"No words found with length {length}. Try a different number.")
+            return
+        if interaction.channel_id in state.races:
+            await interaction.followup.send("A race is already running in this channel. Join it with `/raceguess yourword`.")
+            return
+
+        # Claim the channel before awaiting anything, so a second /wordlerace can't slip in
+        race = RaceSession(str(interaction.guild.id), interaction.channel_id, resources, duration)
+        state.races[interaction.channel_id] = race
+        try:
+            # A channel message, unlike a followup, can still be edited after the interaction token expires
+            race.message = await interaction.channel.send(race.render())
+        except Exception:
+            # Release the channel so a failed send doesn't leave a race that never ends
+            if state.races.get(interaction.channel_id) is race:
+                del state.races[interaction.channel_id]
+            raise
+        bot.loop.create_task(finish_race(state, race))
+        await interaction.followup.send(f"Race started! Everyone has {duration} seconds.")
+    except Exception as e:
+        logging.error(f"Error in /wordlerace: {e}")
+        await interaction.followup.send("An error occurred while starting the race. Please try again later.")
+
+async def finish_race(state, race):
+    try:
+        await race.run()
+    finally:
+        if state.races.get(race.channel_id) is race:
+            del state.races[race.channel_id]
+
+    # Record the results before touching Discord, so a failed edit can't lose them
+    for player in race.players.values():
+        event_log.log_finish(
+            player.user_id, race.server_id, race.word_length,
+            won=player.solved, guesses=len(player.history),
+            seconds=int(player.solved_at if player.solved else race.elapsed())
+        )
+
+    # Update stats only if the word length is 5, all players in one write
+    if race.word_length == 5:
+        try:
+            await stats.update_stats_batch(race.server_id, race.stats_results())
+            state.invalidate_leaderboards(race.server_id)
+        except Exception as e:
+            logging.error(f"Error saving race stats: {e}")
+
+    try:
+        word_meaning = await asyncio.to_thread(fetch_word_meaning, race.scorer.get_secret_word())
+        await race.message.edit(content=f"{race.render(final=True)}\n\n**Word Meaning:** {word_meaning}")
+    except Exception as e:
+        logging.error(f"Error posting race results: {e}")
+
+# Command: Guess in a Race
+@bot.tree.command(name="raceguess", description="Make a guess in this channel's Wordle race.")
+async def race_guess(interaction: discord.Interaction, guess: str):
+    try:
+        state = router.state_for(interaction.guild_id)
+        race = state.races.get(interaction.channel_id)
+        if race is None:
+            await interaction.response.send_message("There's no race in this channel. Start one with `/wordlerace`.", ephemeral=True)
+            return
+
+        joined = interaction.user.id in race.players
+        player, error = race.guess(interaction.user.id, interaction.user.name, guess)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
+            return
+
+        if not joined:
+            event_log.log_start(interaction.user.id, interaction.guild.id, race.word_length)
+        event_log.log_guess(interaction.user.id, interaction.guild.id, *player.history[-1])
+
+        # The board is only shown to the player; the channel sees the batched progress message
+        await interaction.response.send_message(race.format_player(player), ephemeral=True)
+    except Exception as e:
+        logging.error(f"Error in /raceguess: {e}")
+        await interaction.response.send_message("An error occurred while processing your guess. Please try again later.", ephemeral=True)
+
 # Command: View Statistics
 @bot.tree.command(name="wordleuserstats", description="View your Wordle statistics.")
-async def view_stats(interaction: discord.Interaction):
+@app_commands.describe(chart="Attach a chart of your guess distribution, streaks and recent games")
+async def view_stats(interaction: discord.Interaction, chart: bool = False):
     # Fetch stats for the user in the current server
     stats_data = await stats.fetch_stats(
         user_id=str(interaction.user.id),
@@ -219,6 +378,26 @@ async def view_stats(interaction: discord.Interaction):
     else:
         embed.add_field(name="Guess Distribution", value="No data available", inline=False)
 
+    # Render the optional chart off the event loop
+    if chart:
+        try:
+            async with trend_lock:
+                await asyncio.to_thread(trend_stats.update, event_log.directory)
+            trend = trend_stats.fetch_stats(str(interaction.guild.id), str(interaction.user.id))["recent"]
+            png = await charts.render_stats_chart(
+                user_id=str(interaction.user.id),
+                server_id=str(interaction.guild.id),
+                username=interaction.user.name,
+                stats_data=stats_data,
+                trend=trend
+            )
+            chart_file = discord.File(io.BytesIO(png), filename="wordle_stats.png")
+            embed.set_image(url="attachment://wordle_stats.png")
+            await interaction.followup.send(embed=embed, file=chart_file)
+            return
+        except Exception as e:
+            logging.error(f"Error rendering stats chart: {e}")
+
     # Send the embed
     await interaction.followup.send(embed=embed)
 
@@ -248,17 +427,22 @@ async def wordleleaderboard(interaction: discord.Interaction, category: app_comm
         }
 
 
-        if category.value == "fastest_solve":
-            # Fetch top 10 fastest solves from the new table
-            leaderboard = await stats.fetch_fastest_solves(
-                server_id=str(interaction.guild.id)
-            )
-        else:
-            # Fetch leaderboard data for other categories
-            leaderboard = await stats.fetch_leaderboard(
-                server_id=str(interaction.guild.id),
-                category=category.value
-            )
+        # Leaderboards are cached per shard until a game in this server finishes
+        state = router.state_for(interaction.guild_id)
+        leaderboard = state.get_leaderboard(str(interaction.guild.id), category.value)
+        if leaderboard is None:
+            if category.value == "fastest_solve":
+                # Fetch top 10 fastest solves from the new table
+                leaderboard = await stats.fetch_fastest_solves(
+                    server_id=str(interaction.guild.id)
+                )
+            else:
+                # Fetch leaderboard data for other categories
+                leaderboard = await stats.fetch_leaderboard(
+                    server_id=str(interaction.guild.id),
+                    category=category.value
+                )
+            state.set_leaderboard(str(interaction.guild.id), category.value, leaderboard)
 
         # Create the embed
         embed = discord.Embed(
@@ -309,7 +493,9 @@ async def help_wordle(interaction: discord.Interaction):
         "**Commands:**\n"
         "`/startwordle [length]` – Starts a new game. You can specify the word length (default is 5).\n"
         "`/guessword yourword` – Submit a guess for the current game.\n"
-        "`/wordleuserstats` – View your Wordle statistics, including games played, win percentage, and streaks.\n"
+        "`/wordlerace [length] [duration]` – Start a race where everyone in the channel guesses the same word.\n"
+        "`/raceguess yourword` – Submit a guess in the channel's race.\n"
+        "`/wordleuserstats [chart]` – View your Wordle statistics, including games played, win percentage, and streaks. Set `chart` to attach a chart with your recent games.\n"
         "`/wordleleaderboard [category]` – View the top players in the server for a specific category.\n"
         "`/helpwordle` – Shows this help message.\n\n"
         "**Leaderboard Categories:**\n"
@@ -339,5 +525,9 @@ async def help_wordle(interaction: discord.Interaction):
     
 
 # Keep the bot alive and run it
-keep_alive()
-bot.run(TOKEN)
+if __name__ == "__main__":
+    if not STARTUP_BENCH:
+        keep_alive()
+    bot.run(TOKEN)
+    charts.shutdown()
+    event_log.close()
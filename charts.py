@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Stats chart rendering for /wordleuserstats.
+
+A chart shows the guess distribution, games and streaks, and the trend of the
+player's last games taken from the event log (see events.TREND_GAMES).
+Charts are rendered with matplotlib's Agg backend in a small process pool so
+the event loop never blocks on drawing. Rendered PNGs are cached by
+(user, server, stats version), so the same chart is only drawn once.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logging.basicConfig(level=logging.INFO)
+
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "1"))
+# Workers are replaced after this many renders so leaked figures can't pile up
+CHART_TASKS_PER_WORKER = int(os.getenv("CHART_TASKS_PER_WORKER", "50"))
+# Hard address-space limit for each worker, 0 disables it
+CHART_WORKER_MEMORY_MB = int(os.getenv("CHART_WORKER_MEMORY_MB", "512"))
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "256"))
+
+_executor = None
+_cache = OrderedDict()  # (user_id, server_id, version) -> PNG bytes, oldest first
+_pending = {}  # Renders in flight, so concurrent requests share one render
+
+
+def _init_worker(memory_mb):
+    # Runs once in every worker process
+    import matplotlib
+    matplotlib.use("Agg")
+    if memory_mb:
+        try:
+            import resource
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logging.warning(f"Could not limit chart worker memory: {e}")
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        kwargs = {
+            "max_workers": CHART_WORKERS,
+            "mp_context": multiprocessing.get_context("spawn"),
+            "initializer": _init_worker,
+            "initargs": (CHART_WORKER_MEMORY_MB,),
+        }
+        try:
+            _executor = ProcessPoolExecutor(max_tasks_per_child=CHART_TASKS_PER_WORKER, **kwargs)
+        except TypeError:
+            # max_tasks_per_child needs Python 3.11+
+            _executor = ProcessPoolExecutor(**kwargs)
+    return _executor
+
+
+def stats_version(stats_data, trend=()):
+    """
+    Build a version key that changes whenever the stats behind a chart change.
+    """
+    guess_distribution = stats_data.get("guess_distribution") or {}
+    return (
+        tuple(tuple(game) for game in trend),
+        stats_data.get("games_played", 0),
+        stats_data.get("games_won", 0),
+        stats_data.get("current_streak", 0),
+        stats_data.get("max_streak", 0),
+        stats_data.get("fastest_time", 0),
+        stats_data.get("average_time", 0),
+        tuple(sorted(guess_distribution.items())),
+    )
+
+
+def _render_stats_chart(username, stats_data, trend):
+    # Runs in a worker process
+    import io
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import MaxNLocator
+
+    guess_distribution = stats_data.get("guess_distribution") or {}
+    guesses = sorted(guess_distribution, key=int)
+    counts = [guess_distribution[guess] for guess in guesses]
+
+    fig, (dist_ax, summary_ax, trend_ax) = plt.subplots(1, 3, figsize=(12, 3.5))
+    try:
+        fig.suptitle(f"{username}'s Wordle Statistics")
+
+        # Guess distribution
+        if guesses:
+            dist_ax.barh(guesses, counts, color="#6aaa64")
+            dist_ax.invert_yaxis()
+            for y, count in enumerate(counts):
+                dist_ax.text(count, y, f" {count}", va="center")
+        else:
+            dist_ax.text(0.5, 0.5, "No data available", ha="center", va="center")
+        dist_ax.set_title("Guess Distribution")
+        dist_ax.set_xlabel("Games")
+        dist_ax.set_ylabel("Guesses")
+
+        # Won / lost games and streaks
+        games_played = stats_data.get("games_played", 0)
+        games_won = stats_data.get("games_won", 0)
+        labels = ["Won", "Lost", "Streak", "Max Streak"]
+        values = [
+            games_won,
+            max(games_played - games_won, 0),
+            stats_data.get("current_streak", 0),
+            stats_data.get("max_streak", 0),
+        ]
+        summary_ax.bar(labels, values, color=["#6aaa64", "#787c7e", "#c9b458", "#c9b458"])
+        summary_ax.set_title("Games and Streaks")
+
+        # Guesses used in each of the last games, losses in grey
+        if trend:
+            games = range(1, len(trend) + 1)
+            trend_ax.plot(games, [guesses for _, guesses, _ in trend], color="#c9b458", zorder=1)
+            trend_ax.scatter(
+                games, [guesses for _, guesses, _ in trend],
+                color=["#6aaa64" if won else "#787c7e" for won, _, _ in trend], zorder=2
+            )
+            trend_ax.set_xticks(list(games))
+            trend_ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        else:
+            trend_ax.text(0.5, 0.5, "No recent games", ha="center", va="center")
+        trend_ax.set_title(f"Last {len(trend)} Games" if trend else "Recent Games")
+        trend_ax.set_xlabel("Game")
+        trend_ax.set_ylabel("Guesses")
+
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=100)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+async def _render_in_pool(username, stats_data, trend):
+    # A worker that dies (e.g. over the memory limit) breaks the whole pool,
+    # so replace the pool and retry once
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return await loop.run_in_executor(executor, _render_stats_chart, username, stats_data, trend)
+        except BrokenProcessPool:
+            logging.warning("Chart worker pool broke, starting a new one")
+            if _executor is executor:
+                shutdown()
+            if attempt:
+                raise
+
+
+async def render_stats_chart(user_id, server_id, username, stats_data, trend=()):
+    """
+    Return the PNG stats chart for a user, rendering it only if these stats haven't been drawn yet.
+    trend is the [won, guesses, seconds] list of the user's last games, oldest first.
+    """
+    key = (user_id, server_id, stats_version(stats_data, trend))
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    if key not in _pending:
+        _pending[key] = asyncio.ensure_future(_render_in_pool(username, stats_data, list(trend)))
+    try:
+        png = await asyncio.shield(_pending[key])
+    finally:
+        _pending.pop(key, None)
+
+    # Older versions of this user's chart can't be requested again
+    for old_key in [k for k in _cache if k[:2] == key[:2]]:
+        del _cache[old_key]
+    _cache[key] = png
+    while len(_cache) > CHART_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return png
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only game event log and a streaming stats aggregator.
+
+Every game start, guess and finish is appended as one line of JSON to
+numbered segment files ({prefix}-000001.ndjson, {prefix}-000002.ndjson, ...).
+A new segment is started whenever the log is opened and once the current one
+reaches EVENT_LOG_MAX_BYTES; segments are never appended to after that, so a
+line cut short by a crash stays on its own. Each bot process writes its own prefix.
+
+StatsAggregator replays the log for any word length and remembers how far it
+has read, so later runs only process new events.
+
+Usage:
+    python events.py --server SERVER_ID [--length 5] [--category win_percentage] [--checkpoint FILE]
+"""
+
+import argparse
+import bisect
+import glob
+import json
+import logging
+import os
+import re
+import time
+
+logging.basicConfig(level=logging.INFO)
+
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", "events")
+EVENT_LOG_MAX_BYTES = int(os.getenv("EVENT_LOG_MAX_BYTES", str(16 * 1024 * 1024)))
+# Finished games kept per player for the trend chart
+TREND_GAMES = int(os.getenv("TREND_GAMES", "20"))
+# Fastest solves kept per server, like the fastest_solves table
+FASTEST_SOLVES = 10
+
+FEEDBACK_CODES = {"🟩": "G", "🟨": "Y", "⬛": "B"}
+
+_SEGMENT_PATTERN = re.compile(r"^(?P<prefix>.+)-(?P<number>\d{6})\.ndjson$")
+
+
+def feedback_code(result):
+    """
+    Convert an emoji result such as 🟩🟨⬛⬛🟩 into its compact form, GYBBG.
+    """
+    return "".join(FEEDBACK_CODES[square] for square in result)
+
+
+class EventLog:
+    """
+    Newline-delimited JSON event log with size-based rotation.
+    """
+    def __init__(self, directory=EVENT_LOG_DIR, prefix="events", max_bytes=EVENT_LOG_MAX_BYTES):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.file = None
+        self.segment = None  # Found on the first write, so creating the log touches no files
+
+    def _open(self):
+        if self.file is None or self.file.tell() >= self.max_bytes:
+            if self.file is not None:
+                self.file.close()
+            if self.segment is None:
+                os.makedirs(self.directory, exist_ok=True)
+                numbers = [number for prefix, number, _ in list_segments(self.directory) if prefix == self.prefix]
+                self.segment = max(numbers, default=0)
+            # Always start a new segment rather than append to one an earlier process may have cut short
+            self.segment += 1
+            path = os.path.join(self.directory, f"{self.prefix}-{self.segment:06d}.ndjson")
+            self.file = open(path, "x", encoding="utf-8")
+        return self.file
+
+    def append(self, event, user_id, server_id, **fields):
+        record = {"ts": round(time.time(), 3), "ev": event, "u": str(user_id), "s": str(server_id), **fields}
+        try:
+            file = self._open()
+            file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            file.flush()
+        except OSError as e:
+            # Losing an event must never break a game
+            logging.error(f"Failed to write {event} event: {e}")
+
+    def log_start(self, user_id, server_id, length):
+        self.append("start", user_id, server_id, len=length)
+
+    def log_guess(self, user_id, server_id, word, result):
+        self.append("guess", user_id, server_id, w=word, fb=feedback_code(result))
+
+    def log_finish(self, user_id, server_id, length, won, guesses, seconds):
+        self.append("finish", user_id, server_id, len=length, won=won, n=guesses, secs=seconds)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def list_segments(directory):
+    """
+    Return (prefix, number, path) for every segment in the directory, oldest first per prefix.
+    """
+    segments = []
+    for path in glob.glob(os.path.join(directory, "*.ndjson")):
+        match = _SEGMENT_PATTERN.match(os.path.basename(path))
+        if match:
+            segments.append((match.group("prefix"), int(match.group("number")), path))
+    return sorted(segments)
+
+
+def _empty_stats():
+    return {
+        "games_played": 0,
+        "games_won": 0,
+        "fastest_time": 0,
+        "average_time": 0.0,
+        "guess_distribution": {},
+        "current_streak": 0,
+        "max_streak": 0,
+        "recent": []  # [won, guesses, seconds] of the last TREND_GAMES finished games, oldest first
+    }
+
+
+class StatsAggregator:
+    """
+    Builds per (server, user, word length) stats from the event log, incrementally.
+    Stats follow the same rules as Stats.update_stats, but for every word length.
+    """
+    def __init__(self):
+        self.stats = {}  # (server_id, user_id, length) -> stats dict
+        self.fastest_solves = {}  # (server_id, length) -> [seconds, user_id] of the quickest wins, fastest first
+        self.positions = {}  # prefix -> [segment number, byte offset]
+
+    def feed(self, record):
+        if record["ev"] not in ("start", "finish"):
+            return
+        key = (record["s"], record["u"], record["len"])
+        row = self.stats.setdefault(key, _empty_stats())
+
+        if record["ev"] == "start":
+            row["games_played"] += 1
+            return
+
+        row["recent"].append([record["won"], record["n"], record["secs"]])
+        del row["recent"][:-TREND_GAMES]
+        if record["won"]:
+            time_taken = record["secs"]
+            total_time = row["average_time"] * row["games_won"] + time_taken
+            row["games_won"] += 1
+            row["average_time"] = total_time / row["games_won"]
+            if row["fastest_time"] == 0 or time_taken < row["fastest_time"]:
+                row["fastest_time"] = time_taken
+            guesses = str(record["n"])
+            row["guess_distribution"][guesses] = row["guess_distribution"].get(guesses, 0) + 1
+            row["current_streak"] += 1
+            row["max_streak"] = max(row["max_streak"], row["current_streak"])
+
+            solves = self.fastest_solves.setdefault((record["s"], record["len"]), [])
+            bisect.insort(solves, [time_taken, record["u"]])
+            del solves[FASTEST_SOLVES:]
+        else:
+            row["current_streak"] = 0
+
+    def update(self, directory=EVENT_LOG_DIR):
+        """
+        Read every event written since the last update. Returns the number of events read.
+        """
+        count = 0
+        segments = list_segments(directory)
+        newest = {prefix: number for prefix, number, _ in segments}
+        for prefix, number, path in segments:
+            segment, offset = self.positions.get(prefix, (0, 0))
+            if number < segment:
+                continue
+            if number > segment:
+                offset = 0
+            with open(path, "rb") as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b"\n") and number == newest[prefix]:
+                        break  # May still be being written, pick it up next time
+                    offset += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Cut short by a crash, the writer has moved on to a new segment
+                        logging.warning(f"Skipping unreadable event in {path}: {line[:80]!r}")
+                        continue
+                    self.feed(record)
+                    count += 1
+            self.positions[prefix] = [number, offset]
+        return count
+
+    def fetch_stats(self, server_id, user_id, length=5):
+        return self.stats.get((str(server_id), str(user_id), length), _empty_stats())
+
+    def leaderboard(self, server_id, category, length=5, limit=5):
+        """
+        Rank a server's players like Stats.fetch_leaderboard, for any word length.
+        fastest_solve lists the server's quickest individual wins, like Stats.fetch_fastest_solves.
+        """
+        rows = [
+            (user_id, row) for (server, user_id, row_length), row in self.stats.items()
+            if server == str(server_id) and row_length == length
+        ]
+        if category == "win_percentage":
+            entries = [(user_id, row["games_won"] / row["games_played"]) for user_id, row in rows if row["games_played"] > 0]
+            reverse = True
+        elif category in ("fastest_time", "average_time"):
+            entries = [(user_id, row[category] if row[category] > 0 else float("inf")) for user_id, row in rows]
+            reverse = False
+        elif category == "max_streak":
+            entries = [(user_id, row["max_streak"]) for user_id, row in rows]
+            reverse = True
+        elif category == "fastest_solve":
+            # Individual solves, so a player can appear more than once
+            solves = self.fastest_solves.get((str(server_id), length), [])
+            return [{"user_id": user_id, "value": seconds} for seconds, user_id in solves[:limit]]
+        else:
+            raise ValueError(f"Invalid category: {category}")
+
+        entries.sort(key=lambda entry: entry[1], reverse=reverse)
+        return [{"user_id": user_id, "value": value} for user_id, value in entries[:limit]]
+
+    def save(self, path):
+        state = {
+            "positions": self.positions,
+            "stats": [[server, user, length, row] for (server, user, length), row in self.stats.items()],
+            "fastest_solves": [[server, length, solves] for (server, length), solves in self.fastest_solves.items()],
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+
+    @classmethod
+    def load(cls, path):
+        aggregator = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if "fastest_solves" not in state:
+                # Saved before fastest solves and trends were tracked, so replay the whole log instead
+                logging.warning(f"Ignoring outdated checkpoint {path}, rebuilding from the event log")
+                return aggregator
+            aggregator.positions = state["positions"]
+            aggregator.stats = {(server, user, length): row for server, user, length, row in state["stats"]}
+            aggregator.fastest_solves = {(server, length): solves for server, length, solves in state["fastest_solves"]}
+        return aggregator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Wordle stats from the event log")
+    parser.add_argument("--dir", default=EVENT_LOG_DIR, help="Event log directory")
+    parser.add_argument("--server", required=True, help="Server id to rank")
+    parser.add_argument("--length", type=int, default=5, help="Word length")
+    parser.add_argument("--category", default="win_percentage",
+                        choices=["win_percentage", "fastest_time", "average_time", "max_streak", "fastest_solve"])
+    parser.add_argument("--checkpoint", help="File to resume from and save progress to")
+    args = parser.parse_args()
+
+    aggregator = StatsAggregator.load(args.checkpoint) if args.checkpoint else StatsAggregator()
+    count = aggregator.update(args.dir)
+    print(f"Read {count} new events")
+    for rank, entry in enumerate(aggregator.leaderboard(args.server, args.category, args.length), start=1):
+        print(f"#{rank}: {entry['user_id']} - {entry['value']}")
+    if args.checkpoint:
+        aggregator.save(args.checkpoint)
+
+
+if __name__ == "__main__":
+    main()
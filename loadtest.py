@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Load test for the Wordle bot command handlers.
+
+Drives start_wordle, guess_word, view_stats and wordleleaderboard directly
+with fake interactions, against an in-memory stand-in for Supabase, and
+reports latency percentiles, throughput, event-loop lag and RSS growth.
+--trace-memory runs a separate pass that traces allocations and only reports memory.
+
+Usage:
+    python loadtest.py --players 1000 --duration 30 --guess-rate 0.5
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import resource
+import os
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+
+# ---------------------------------------------------------------------------
+# In-memory stand-in for the Supabase client used by Stats.py
+# ---------------------------------------------------------------------------
+
+class MemoryQuery:
+    """
+    Supports the subset of the supabase query builder that Stats.py uses.
+    """
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.filters = []
+
+    def select(self, columns="*"):
+        self.action = "select"
+        return self
+
+    def insert(self, payload):
+        self.action, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload):
+        self.action, self.payload = "upsert", payload
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def _matches(self, row):
+        return all(check(row) for check in self.filters)
+
+    def execute(self):
+        if self.client.latency:
+            time.sleep(self.client.latency)  # The real client is synchronous too
+        rows = self.client.tables.setdefault(self.table, {})
+        self.client.calls += 1
+
+        if self.action == "select":
+            data = [dict(row) for row in rows.values() if self._matches(row)]
+        elif self.action == "delete":
+            data = [rows.pop(key) for key, row in list(rows.items()) if self._matches(row)]
+        else:
+            data = []
+            for row in self.payload if isinstance(self.payload, list) else [self.payload]:
+                key = self.client.key(self.table, row)
+                if self.action == "upsert" and key in rows:
+                    rows[key].update(row)
+                elif self.table == "user_stats":
+                    rows[key] = {**self.client.USER_STATS_DEFAULTS, **row}
+                else:
+                    rows[key] = dict(row)
+                data.append(dict(rows[key]))
+        return types.SimpleNamespace(data=data)
+
+
+class MemorySupabase:
+    # Column defaults of the user_stats table, applied to new rows
+    USER_STATS_DEFAULTS = {
+        "games_played": 0,
+        "games_won": 0,
+        "fastest_time": 0,
+        "average_time": 0,
+        "guess_distribution": {},
+        "current_streak": 0,
+        "max_streak": 0,
+    }
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.tables = {}
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    def key(self, table, row):
+        if table == "user_stats":
+            return (row["user_id"], row["server_id"])
+        row.setdefault("id", next(self._ids))
+        return row["id"]
+
+    def table(self, name):
+        return MemoryQuery(self, name)
+
+
+# ---------------------------------------------------------------------------
+# Fake discord.Interaction
+# ---------------------------------------------------------------------------
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+
+    async def send_message(self, content=None, **kwargs):
+        self.done = True
+        self.interaction.messages.append(content)
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        self.interaction.messages.append(content if content is not None else kwargs.get("embed"))
+
+
+class FakeInteraction:
+    def __init__(self, user_id, guild_id):
+        self.user = types.SimpleNamespace(id=user_id, name=f"player{user_id}")
+        self.guild = types.SimpleNamespace(id=guild_id)
+        self.guild_id = guild_id
+        self.messages = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+
+# ---------------------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------------------
+
+def _install_stand_ins(backend_latency, word_count, seed):
+    """
+    Import bot.py with the Supabase client, word list, dictionary API and
+    user lookups replaced by local stand-ins. Returns the bot module.
+    """
+    client = MemorySupabase(backend_latency)
+    sys.modules["supabase_client"] = types.SimpleNamespace(supabase=client)
+    os.environ.setdefault("EVENT_LOG_DIR", tempfile.mkdtemp(prefix="wordle-loadtest-"))
+
+    import words
+    rng = random.Random(seed)
+    words.WORD_LIST = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        for length in range(5, 14) for _ in range(word_count)
+    ]
+
+    import bot
+    bot.fetch_word_meaning = lambda word: "No definition found."
+
+    async def fetch_user(user_id):
+        return types.SimpleNamespace(id=user_id, name=f"player{user_id}")
+    bot.bot.fetch_user = fetch_user
+    return bot, client
+
+
+class Metrics:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = 0
+        self.loop_lag = []
+
+    def record(self, command, seconds):
+        self.latencies.setdefault(command, []).append(seconds)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+# The handlers catch their own exceptions and reply with this text
+ERROR_REPLY_PREFIX = "An error occurred"
+
+
+async def _timed(metrics, command, interaction, coro):
+    started = time.perf_counter()
+    try:
+        await coro
+    except Exception as e:
+        metrics.errors += 1
+        logging.error(f"{command} raised: {e}")
+    else:
+        if any(isinstance(message, str) and message.startswith(ERROR_REPLY_PREFIX) for message in interaction.messages):
+            metrics.errors += 1
+    metrics.record(command, time.perf_counter() - started)
+
+
+def _call(metrics, command, handler, interaction, *args):
+    return _timed(metrics, command, interaction, handler.callback(interaction, *args))
+
+
+async def _player(bot, metrics, user_id, guild_id, guess_rate, stats_rate, win_rate, deadline, rng):
+    from discord import app_commands
+
+    categories = ["win_percentage", "fastest_time", "average_time", "max_streak", "fastest_solve"]
+    games = bot.router.state_for(guild_id).games
+
+    while time.perf_counter() < deadline:
+        await _call(metrics, "start_wordle", bot.start_wordle, FakeInteraction(user_id, guild_id), 5)
+
+        while user_id in games and time.perf_counter() < deadline:
+            await asyncio.sleep(rng.expovariate(guess_rate))
+            game = games.get(user_id, {}).get("game")
+            if game is None:
+                break
+            guess = game.get_secret_word() if rng.random() < win_rate else rng.choice(game.word_list)
+            await _call(metrics, "guess_word", bot.guess_word, FakeInteraction(user_id, guild_id), guess)
+
+        if rng.random() < stats_rate:
+            await _call(metrics, "view_stats", bot.view_stats, FakeInteraction(user_id, guild_id))
+            category = rng.choice(categories)
+            choice = app_commands.Choice(name=category, value=category)
+            await _call(metrics, "wordleleaderboard", bot.wordleleaderboard, FakeInteraction(user_id, guild_id), choice)
+
+
+async def _monitor_loop_lag(metrics, interval, deadline):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        metrics.loop_lag.append(time.perf_counter() - started - interval)
+
+
+async def run_load(bot, players, guilds, duration, guess_rate, stats_rate, win_rate, seed=0):
+    """
+    Run the player population for `duration` seconds and return the collected metrics.
+    """
+    rng = random.Random(seed)
+    metrics = Metrics()
+    deadline = time.perf_counter() + duration
+    tasks = [
+        _player(bot, metrics, user_id, rng.randrange(guilds) + 1, guess_rate, stats_rate, win_rate,
+                deadline, random.Random(rng.random()))
+        for user_id in range(1, players + 1)
+    ]
+    await asyncio.gather(_monitor_loop_lag(metrics, 0.01, deadline), *tasks)
+    return metrics
+
+
+def _current_rss():
+    # Resident set size in bytes; falls back to the peak where /proc isn't available
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wordle bot load test")
+    parser.add_argument("--players", type=int, default=1000, help="Concurrent players")
+    parser.add_argument("--guilds", type=int, default=50, help="Servers the players are spread across")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--guess-rate", type=float, default=0.5, help="Guesses per second per player")
+    parser.add_argument("--stats-rate", type=float, default=0.2, help="Chance of checking stats after a game")
+    parser.add_argument("--win-rate", type=float, default=0.2, help="Chance a guess is the secret word")
+    parser.add_argument("--backend-latency", type=float, default=0.0, help="Seconds added to every stats query")
+    parser.add_argument("--words", type=int, default=2000, help="Words per length in the stand-in word list")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace allocations instead of measuring latency (tracing skews timings)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    bot, client = _install_stand_ins(args.backend_latency, args.words, args.seed)
+    logging.getLogger().setLevel(logging.WARNING)  # WordleGame logs every secret at INFO
+
+    if args.trace_memory:
+        # tracemalloc slows every allocation, so this pass only reports memory
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        asyncio.run(run_load(
+            bot, args.players, args.guilds, args.duration,
+            args.guess_rate, args.stats_rate, args.win_rate, args.seed
+        ))
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        print(f"{args.players} players, {args.guilds} servers, memory pass (latency not measured)")
+        print(f"Memory: {(memory_after - memory_before) / 1e6:+.2f} MB traced growth, {memory_peak / 1e6:.2f} MB traced peak")
+        print("Largest allocation sites:")
+        for stat in snapshot.statistics("lineno")[:10]:
+            print(f"  {stat.size / 1e6:8.2f} MB  {stat.traceback}")
+        print(f"Active games left: {bot.router.active_games()}")
+        return
+
+    rss_before = _current_rss()
+    started = time.perf_counter()
+    metrics = asyncio.run(run_load(
+        bot, args.players, args.guilds, args.duration,
+        args.guess_rate, args.stats_rate, args.win_rate, args.seed
+    ))
+    elapsed = time.perf_counter() - started
+    rss_after = _current_rss()
+
+    total = sum(len(values) for values in metrics.latencies.values())
+    print(f"{args.players} players, {args.guilds} servers, {elapsed:.1f}s")
+    print(f"{'command':<20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for command, values in sorted(metrics.latencies.items()):
+        print(
+            f"{command:<20}{len(values):>8}"
+            f"{percentile(values, 50) * 1000:>10.2f}{percentile(values, 95) * 1000:>10.2f}"
+            f"{percentile(values, 99) * 1000:>10.2f}"
+        )
+    print(f"Throughput: {total / elapsed:.1f} commands/s, {client.calls / elapsed:.1f} stats queries/s")
+    print(f"Errors: {metrics.errors} (exceptions and error replies)")
+    print(
+        f"Event loop lag: p50 {percentile(metrics.loop_lag, 50) * 1000:.2f} ms, "
+        f"p99 {percentile(metrics.loop_lag, 99) * 1000:.2f} ms, max {max(metrics.loop_lag, default=0) * 1000:.2f} ms"
+    )
+    print(
+        f"Memory: {(rss_after - rss_before) / 1e6:+.2f} MB RSS growth, "
+        f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB max RSS "
+        f"(use --trace-memory for allocation detail)"
+    )
+    print(f"Active games left: {bot.router.active_games()}")
+
+
+if __name__ == "__main__":
+    main()
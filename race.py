@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Multiplayer race mode: everyone in a channel plays the same secret word.
+
+A race keeps one WordleGame for the secret and the shared word index, and a
+small RacePlayer per player. Progress is shown in a single channel message
+that is edited at most once per RACE_UPDATE_INTERVAL seconds, however many
+guesses come in.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from wordle import WordleGame
+
+logging.basicConfig(level=logging.INFO)
+
+RACE_UPDATE_INTERVAL = float(os.getenv("RACE_UPDATE_INTERVAL", "3"))
+RACE_BOARD_ROWS = 25  # Keeps the progress message under Discord's 2000 character limit
+
+
+class RacePlayer:
+    """
+    Per-player state of a race.
+    """
+    __slots__ = ("user_id", "name", "history", "solved_at")
+
+    def __init__(self, user_id, name):
+        self.user_id = user_id
+        self.name = name
+        self.history = []  # (word, result) pairs
+        self.solved_at = None  # Seconds from the start of the race
+
+    @property
+    def solved(self):
+        return self.solved_at is not None
+
+    def best_greens(self):
+        return max((result.count("🟩") for _, result in self.history), default=0)
+
+
+class RaceSession:
+    """
+    A race in one channel. The scorer game holds the secret word and the word index shared by every player.
+    resources is the words.LengthResources of the race's word length.
+    """
+    def __init__(self, server_id, channel_id, resources, duration):
+        self.scorer = WordleGame(
+            resources.words, word_length=resources.length,
+            valid_words=resources.valid_words
+        )
+        self.server_id = server_id
+        self.channel_id = channel_id
+        self.word_length = resources.length
+        self.max_guesses = resources.length + 1
+        self.duration = duration
+        self.started = time.monotonic()
+        self.players = {}
+        self.message = None  # The progress message, edited in place
+        self.dirty = asyncio.Event()
+        self.done = asyncio.Event()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def is_finished(self, player):
+        return player.solved or len(player.history) >= self.max_guesses
+
+    def guess(self, user_id, name, word):
+        """
+        Score a guess for a player, joining them on their first valid guess.
+        Returns (player, error message or None).
+        """
+        player = self.players.get(user_id)
+        history = player.history if player else []
+        word = word.lower()
+
+        if self.done.is_set():
+            return player, "This race is over."
+        if player and self.is_finished(player):
+            return player, "You've already finished this race."
+        if any(guess == word for guess, _ in history):
+            return player, f"You've already guessed the word '{word}'. Try a different word."
+        if len(word) != self.word_length:
+            return player, f"Guess must be {self.word_length} letters long."
+        if word not in self.scorer.valid_words:
+            return player, f"{word} is not a valid word."
+
+        if player is None:
+            player = self.players[user_id] = RacePlayer(user_id, name)
+        player.history.append((word, self.scorer._evaluate_guess(word)))
+        if word == self.scorer.get_secret_word():
+            player.solved_at = self.elapsed()
+        self.dirty.set()
+        return player, None
+
+    def format_player(self, player):
+        """
+        The player's own board, sent only to them.
+        """
+        remaining = self.max_guesses - len(player.history)
+        if player.solved:
+            status = f"✅ Solved in {len(player.history)} guesses ({player.solved_at:.0f}s)!"
+        elif remaining == 0:
+            status = "❌ Out of guesses! The word is revealed when the race ends."
+        else:
+            status = f"{player.history[-1][1]} ({remaining} guesses left)"
+        board = "\n".join(f"{guess.ljust(self.word_length)}: {result}" for guess, result in player.history)
+        return f"{status}\n\nYour guesses:\n```\n{board}\n```"
+
+    def leaderboard(self):
+        """
+        Rank players: solvers by guesses then time, then everyone else by their best number of greens.
+        """
+        solved = sorted((p for p in self.players.values() if p.solved), key=lambda p: (len(p.history), p.solved_at))
+        unsolved = sorted((p for p in self.players.values() if not p.solved), key=lambda p: -p.best_greens())
+        return solved + unsolved
+
+    def render(self, final=False):
+        if final:
+            header = f"🏁 **Wordle race over!** The word was **{self.scorer.get_secret_word()}**."
+        else:
+            remaining = max(0, self.duration - self.elapsed())
+            header = (
+                f"🏁 **Wordle race** – {self.word_length} letters, {self.max_guesses} guesses, "
+                f"{remaining:.0f}s left. Use `/raceguess yourword` to play!"
+            )
+        lines = [header]
+        ranking = self.leaderboard()
+        for rank, player in enumerate(ranking[:RACE_BOARD_ROWS], start=1):
+            last = player.history[-1][1] if player.history else ""
+            if player.solved:
+                progress = f"✅ {len(player.history)}/{self.max_guesses} in {player.solved_at:.0f}s"
+            else:
+                progress = f"{len(player.history)}/{self.max_guesses}"
+            lines.append(f"**#{rank}** {player.name} {last} {progress}")
+        if len(ranking) > RACE_BOARD_ROWS:
+            lines.append(f"…and {len(ranking) - RACE_BOARD_ROWS} more")
+        if not ranking:
+            lines.append("No guesses yet.")
+        return "\n".join(lines)
+
+    def stats_results(self):
+        """
+        Game results for Stats.update_stats_batch.
+        """
+        results = []
+        for player in self.players.values():
+            if player.solved:
+                results.append({
+                    "user_id": str(player.user_id),
+                    "games_played": 1,
+                    "games_won": 1,
+                    "guess_number": len(player.history),
+                    "time_taken": int(player.solved_at),
+                    "won": True
+                })
+            else:
+                results.append({"user_id": str(player.user_id), "games_played": 1, "won": False})
+        return results
+
+    async def run(self):
+        """
+        Edit the progress message at most once per interval until the race ends.
+        Races always run for their full duration so players can still join late.
+        """
+        deadline = self.started + self.duration
+        while not self.done.is_set():
+            timeout = min(RACE_UPDATE_INTERVAL, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            if self.dirty.is_set() and not self.done.is_set():
+                self.dirty.clear()
+                try:
+                    await self.message.edit(content=self.render())
+                except Exception as e:
+                    logging.error(f"Failed to update race message: {e}")
+        self.done.set()
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Shard-aware state for the Wordle bot.
+
+Each shard owns the game sessions, caches and leaderboard indexes of its own
+guilds. Guilds are mapped to shards with Discord's formula
+(guild_id >> 22) % shard_count, so state is always routed to the same shard
+that receives the guild's events. Word data is read-only and shared by every
+shard in the process.
+
+Run `python shards.py --simulate N` to simulate N shard processes locally:
+each one runs bot.py's command handlers against a fake gateway, using the
+stand-ins from loadtest.py.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+logging.basicConfig(level=logging.INFO)
+
+# Seconds a cached leaderboard stays valid when no game in its guild finishes
+LEADERBOARD_TTL = float(os.getenv("LEADERBOARD_TTL", "30"))
+
+
+def shard_id_for(guild_id, shard_count):
+    """
+    Return the shard that owns a guild. DMs (no guild) always go to shard 0.
+    """
+    if guild_id is None:
+        return 0
+    return (int(guild_id) >> 22) % shard_count
+
+
+class ShardState:
+    """
+    Sessions, caches and leaderboard indexes owned by a single shard.
+    """
+    def __init__(self, shard_id):
+        self.shard_id = shard_id
+        self.games = {}  # Active games per user
+        self.races = {}  # Active races per channel
+        self.leaderboards = {}  # (server_id, category) -> (fetched_at, entries)
+
+    def get_leaderboard(self, server_id, category):
+        cached = self.leaderboards.get((server_id, category))
+        if cached and time.monotonic() - cached[0] < LEADERBOARD_TTL:
+            return cached[1]
+        return None
+
+    def set_leaderboard(self, server_id, category, entries):
+        self.leaderboards[(server_id, category)] = (time.monotonic(), entries)
+
+    def invalidate_leaderboards(self, server_id):
+        for key in [key for key in self.leaderboards if key[0] == server_id]:
+            del self.leaderboards[key]
+
+
+class ShardRouter:
+    """
+    Routes guild-scoped state to the shard that owns the guild.
+    shard_count is a number or a callable returning the current count, so a
+    bot whose count is picked by Discord routes with the real value.
+    shard_ids limits the router to the shards this process runs.
+    """
+    def __init__(self, shard_count=1, shard_ids=None):
+        self._shard_count = shard_count
+        self.shard_ids = set(shard_ids) if shard_ids is not None else None
+        self.states = {}  # shard_id -> ShardState, created on first use
+
+    @property
+    def shard_count(self):
+        shard_count = self._shard_count() if callable(self._shard_count) else self._shard_count
+        return shard_count or 1
+
+    def state_for(self, guild_id):
+        shard_id = shard_id_for(guild_id, self.shard_count)
+        if self.shard_ids is not None and shard_id not in self.shard_ids:
+            raise LookupError(f"Guild {guild_id} belongs to shard {shard_id}, which this process doesn't run")
+        state = self.states.get(shard_id)
+        if state is None:
+            state = self.states[shard_id] = ShardState(shard_id)
+        return state
+
+    def active_games(self):
+        return sum(len(state.games) for state in self.states.values())
+
+
+# ---------------------------------------------------------------------------
+# Local multi-process simulation with a fake gateway
+# ---------------------------------------------------------------------------
+
+class FakeGateway:
+    """
+    Stands in for the Discord gateway: delivers only the events of guilds that
+    belong to the connected shard, as Discord does.
+    """
+    def __init__(self, events, shard_id, shard_count):
+        self.events = events
+        self.shard_id = shard_id
+        self.shard_count = shard_count
+
+    def __iter__(self):
+        for event in self.events:
+            if shard_id_for(event["guild_id"], self.shard_count) == self.shard_id:
+                yield event
+
+
+def _make_events(guild_ids, users_per_guild, games_per_user, word_length, seed):
+    rng = random.Random(seed)
+    queues = []
+    for guild_id in guild_ids:
+        for user in range(users_per_guild):
+            user_id = guild_id * 1000 + user
+            queue = []
+            for _ in range(games_per_user):
+                queue.append({"type": "start", "guild_id": guild_id, "user_id": user_id, "length": word_length})
+                queue.extend({"type": "guess", "guild_id": guild_id, "user_id": user_id} for _ in range(word_length + 1))
+            queue.reverse()
+            queues.append(queue)
+
+    # Interleave users like real traffic while keeping each user's events in order
+    events = []
+    while queues:
+        index = rng.randrange(len(queues))
+        events.append(queues[index].pop())
+        if not queues[index]:
+            queues[index] = queues[-1]
+            queues.pop()
+    return events
+
+
+def _run_shard(shard_id, shard_count, events, word_count, results):
+    # Configure this process like a real shard process before bot.py reads its settings
+    os.environ["SHARD_COUNT"] = str(shard_count)
+    os.environ["SHARD_IDS"] = str(shard_id)
+    from loadtest import FakeInteraction, ERROR_REPLY_PREFIX, _install_stand_ins
+
+    bot, _ = _install_stand_ins(0.0, word_count, seed=0)
+    logging.getLogger().setLevel(logging.WARNING)  # WordleGame logs every secret
+    rng = random.Random(shard_id)
+    counts = {"guilds": set(), "events": 0, "started": 0, "finished": 0, "misplaced": 0, "errors": 0}
+    started = time.perf_counter()
+
+    def owner_of(user_id):
+        return [state.shard_id for state in bot.router.states.values() if user_id in state.games]
+
+    async def handle(event):
+        user_id = event["user_id"]
+        interaction = FakeInteraction(user_id, event["guild_id"])
+        if event["type"] == "start":
+            await bot.start_wordle.callback(interaction, event["length"])
+            # The game must live in this shard's state, and only there
+            if owner_of(user_id) == [shard_id]:
+                counts["started"] += 1
+            else:
+                counts["misplaced"] += 1
+        elif owner_of(user_id):
+            game = bot.router.state_for(event["guild_id"]).games[user_id]["game"]
+            # A repeated guess is rejected without using a turn, so never repeat one
+            guessed = {word for word, _ in game.history}
+            guess = rng.choice(game.word_list)
+            while guess in guessed:
+                guess = rng.choice(game.word_list)
+            await bot.guess_word.callback(interaction, guess)
+            if not owner_of(user_id):
+                counts["finished"] += 1
+        counts["errors"] += sum(
+            1 for message in interaction.messages
+            if isinstance(message, str) and message.startswith(ERROR_REPLY_PREFIX)
+        )
+
+    async def run():
+        for event in FakeGateway(events, shard_id, shard_count):
+            counts["guilds"].add(event["guild_id"])
+            counts["events"] += 1
+            await handle(event)
+
+    asyncio.run(run())
+    results.put({
+        "shard_id": shard_id,
+        "guilds": len(counts["guilds"]),
+        "events": counts["events"],
+        "started": counts["started"],
+        "finished": counts["finished"],
+        "misplaced": counts["misplaced"],
+        "errors": counts["errors"],
+        "active": bot.router.active_games(),
+        "states": sorted(bot.router.states),
+        "seconds": time.perf_counter() - started,
+    })
+
+
+def simulate(shard_count, guilds, users_per_guild, games_per_user, word_length=5, seed=0, word_count=2000):
+    """
+    Run shard_count shard processes against a fake gateway and return per-shard results.
+    Each process imports bot.py with its own SHARD_COUNT/SHARD_IDS and plays the events
+    through the real /startwordle and /guessword handlers, using the load test's stand-ins.
+    """
+    rng = random.Random(seed)
+    # Snowflake-like guild ids so the shard formula spreads them like real ones
+    guild_ids = [rng.getrandbits(41) << 22 | rng.getrandbits(22) for _ in range(guilds)]
+    events = _make_events(guild_ids, users_per_guild, games_per_user, word_length, seed)
+
+    # Shards share one event log directory, each under its own prefix
+    os.environ.setdefault("EVENT_LOG_DIR", tempfile.mkdtemp(prefix="wordle-shards-"))
+    # bot.py reads its shard settings at import, so each shard needs a fresh process
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=_run_shard, args=(shard_id, shard_count, events, word_count, results))
+        for shard_id in range(shard_count)
+    ]
+    for process in processes:
+        process.start()
+    shard_results = sorted((results.get() for _ in processes), key=lambda r: r["shard_id"])
+    for process in processes:
+        process.join()
+    return shard_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Wordle bot shards locally")
+    parser.add_argument("--simulate", type=int, default=2, metavar="N", help="Number of shards to simulate")
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--users", type=int, default=5, help="Users per guild")
+    parser.add_argument("--games", type=int, default=2, help="Games per user")
+    parser.add_argument("--length", type=int, default=5, help="Word length")
+    args = parser.parse_args()
+
+    shard_results = simulate(args.simulate, args.guilds, args.users, args.games, args.length)
+    for result in shard_results:
+        print(
+            f"Shard {result['shard_id']}: {result['guilds']} guilds, {result['events']} events, "
+            f"{result['started']} games started, {result['finished']} finished in {result['seconds']:.2f}s"
+        )
+
+    expected_games = args.guilds * args.users * args.games
+    for result in shard_results:
+        assert result["states"] in ([], [result["shard_id"]]), \
+            f"Shard {result['shard_id']} holds state for shards {result['states']}"
+        assert result["misplaced"] == 0, f"Shard {result['shard_id']} stored {result['misplaced']} games outside its state"
+        assert result["errors"] == 0, f"Shard {result['shard_id']} replied with {result['errors']} errors"
+        assert result["active"] == 0, f"Shard {result['shard_id']} left {result['active']} games unfinished"
+    total_guilds = sum(result["guilds"] for result in shard_results)
+    assert total_guilds == args.guilds, f"{total_guilds} guilds handled, expected {args.guilds}"
+    total_started = sum(result["started"] for result in shard_results)
+    total_finished = sum(result["finished"] for result in shard_results)
+    assert total_started == total_finished == expected_games, \
+        f"{total_started} games started and {total_finished} finished, expected {expected_games}"
+    print(f"All {expected_games} games in {args.guilds} guilds were played and finished in their owning shard.")
+
+if __name__ == "__main__":
+    main()
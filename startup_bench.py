@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for the Wordle bot.
+
+Profiles the imports of bot.py and, when a DISCORD_TOKEN is available,
+measures the real time from process start to on_ready. With --lengths it also
+reports the build time and memory of each word length's resources, to weigh
+warming them at startup against a slower first game.
+
+Usage:
+    python startup_bench.py [--budget SECONDS] [--import-budget SECONDS] [--top N] [--skip-ready] [--lengths 5,6,7]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dotenv import load_dotenv
+
+# Modules that should only be loaded when a feature that needs them runs
+LAZY_MODULES = ["matplotlib"]
+
+
+def profile_imports():
+    """
+    Import bot.py in a fresh interpreter with -X importtime.
+    Returns a list of (cumulative_us, module) and the modules that got loaded.
+    """
+    code = (
+        "import sys, bot; "
+        "print(','.join(sorted(sys.modules)))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing bot failed:\n{proc.stderr}")
+
+    profile = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        profile.append((int(cumulative), module.strip()))
+
+    loaded = set(proc.stdout.strip().splitlines()[-1].split(","))
+    return profile, loaded
+
+
+def time_to_ready(timeout):
+    """
+    Run the bot in STARTUP_BENCH mode and return the seconds it reported to reach on_ready.
+    """
+    env = dict(os.environ, STARTUP_BENCH="1")
+    proc = subprocess.run(
+        [sys.executable, "bot.py"],
+        capture_output=True, text=True, env=env, timeout=timeout,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_READY"):
+            return float(line.split()[1])
+    raise RuntimeError(f"Bot never reached on_ready:\n{proc.stderr}")
+
+
+def report_lengths(lengths):
+    """
+    Build the resources of each word length and print their build time and memory.
+    """
+    import time
+    import words
+
+    started = time.perf_counter()
+    words.load_word_list()
+    print(f"Loading the word list took {time.perf_counter() - started:.3f}s")
+    for length in lengths:
+        words.get_resources(length)
+    for row in words.resource_report():
+        print(
+            f"  {row['length']:>2} letters: {row['words']:>6} words, "
+            f"{row['memory_bytes'] / 1e6:6.2f} MB, built in {row['build_seconds']:.3f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wordle bot startup benchmark")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET", "10")),
+                        help="Maximum seconds from process start to on_ready")
+    parser.add_argument("--import-budget", type=float, default=3.0,
+                        help="Maximum seconds spent importing bot.py")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    parser.add_argument("--skip-ready", action="store_true", help="Only profile the imports")
+    parser.add_argument("--lengths", help="Comma separated word lengths to build and report, e.g. 5,6,7")
+    args = parser.parse_args()
+    load_dotenv()
+
+    profile, loaded = profile_imports()
+    total = max((cumulative for cumulative, module in profile if module == "bot"), default=0) / 1e6
+
+    print("Slowest imports (cumulative):")
+    for cumulative, module in sorted(profile, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1e6:8.3f}s  {module}")
+    print(f"Importing bot took {total:.3f}s (budget {args.import_budget:.3f}s)")
+
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    assert not eager, f"Heavy modules loaded at import: {', '.join(eager)}"
+    assert total <= args.import_budget, f"Import time {total:.3f}s over budget {args.import_budget:.3f}s"
+
+    if args.lengths:
+        report_lengths([int(length) for length in args.lengths.split(",")])
+
+    if args.skip_ready or not os.getenv("DISCORD_TOKEN"):
+        print("Skipping time to on_ready (no DISCORD_TOKEN or --skip-ready)")
+        return
+
+    ready = time_to_ready(timeout=args.budget * 3)
+    print(f"Time to on_ready: {ready:.3f}s (budget {args.budget:.3f}s)")
+    assert ready <= args.budget, f"Time to on_ready {ready:.3f}s over budget {args.budget:.3f}s"
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,17 @@ import logging
 
 logging.basicConfig(level=logging.INFO)
 class WordleGame:
-    def __init__(self, word_list, word_length=5):
+    def __init__(self, word_list, word_length=5, valid_words=None):
         self.word_length = word_length
-        self.word_list = [word.lower() for word in word_list if len(word) == word_length and word.isalpha() and word.isascii()]
+        if valid_words is None:
+            self.word_list = [word.lower() for word in word_list if len(word) == word_length and word.isalpha() and word.isascii()]
+            self.valid_words = self.word_list
+        else:
+            # Pre-cleaned words shared with other games, never modified here
+            self.word_list = word_list
+            self.valid_words = valid_words
         self.secret_word = random.choice(self.word_list).lower()
-        if self.secret_word not in self.word_list:
+        if self.secret_word not in self.valid_words:
             self.word_list.append(self.secret_word)  # Ensure the secret word is in the list
         self.remaining_guesses = word_length + 1
         self.history = []
@@ -35,7 +41,7 @@ class WordleGame:
             return f"Guess must be {self.word_length} letters long."
 
         # Check if the word is valid
-        if word not in self.word_list:
+        if word not in self.valid_words:
             self.errors = True
             return f"{word} is not a valid word."
 
@@ -67,36 +73,40 @@ class WordleGame:
         return self.secret_word
     
     def _evaluate_guess(self, guess):
-        result = []
-        secret_temp = list(self.secret_word)
-        guess = list(guess)
-
-        emoji_result = [''] * len(guess)
-        used = [False] * len(secret_temp)
-
-        # First pass: 🟩
-        for i in range(len(guess)):
-            if guess[i] == secret_temp[i]:
-                emoji_result[i] = "🟩"
-                used[i] = True
-            else:
-                emoji_result[i] = None
-
-        # Second pass: 🟨 or ⬛
-        for i in range(len(guess)):
-            if emoji_result[i] is not None:
-                continue
-            if guess[i] in secret_temp:
-                found = False
-                for j in range(len(secret_temp)):
-                    if guess[i] == secret_temp[j] and not used[j]:
-                        emoji_result[i] = "🟨"
-                        used[j] = True
-                        found = True
-                        break
-                if not found:
-                    emoji_result[i] = "⬛"
-            else:
+        return evaluate_guess(self.secret_word, guess)
+
+
+def evaluate_guess(secret_word, guess):
+    result = []
+    secret_temp = list(secret_word)
+    guess = list(guess)
+
+    emoji_result = [''] * len(guess)
+    used = [False] * len(secret_temp)
+
+    # First pass: 🟩
+    for i in range(len(guess)):
+        if guess[i] == secret_temp[i]:
+            emoji_result[i] = "🟩"
+            used[i] = True
+        else:
+            emoji_result[i] = None
+
+    # Second pass: 🟨 or ⬛
+    for i in range(len(guess)):
+        if emoji_result[i] is not None:
+            continue
+        if guess[i] in secret_temp:
+            found = False
+            for j in range(len(secret_temp)):
+                if guess[i] == secret_temp[j] and not used[j]:
+                    emoji_result[i] = "🟨"
+                    used[j] = True
+                    found = True
+                    break
+            if not found:
                 emoji_result[i] = "⬛"
-        
-        return "".join(emoji_result)
+        else:
+            emoji_result[i] = "⬛"
+    
+    return "".join(emoji_result)
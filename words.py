@@ -1,37 +1,11 @@
 import requests
 import logging
+import os
 import re
-def clean_dict_list():
-
-    #fetching the word list from the dictionary api repo
-
-    response =requests.get("https://raw.githubusercontent.com/meetDeveloper/freeDictionaryAPI/refs/heads/master/meta/wordList/english.txt")
-    try:
-        with open("resources/dictionary-raw-word-list.txt","wb") as file:
-            file.write(response.content)
-    except Exception:
-        raise Exception("exception raised")
-    logging.info("dictionary-raw-word-list.txt file created successfully")
-    #remove the undesired words from the list 
-    try:
-        with open("resources/dictionary-raw-word-list.txt","r", encoding="utf-8") as file :
-            DICT_WORD_LIST = file.read().splitlines()
-    except FileNotFoundError:
-        raise FileNotFoundError("file dictionary-raw-word-list.txt not found")
-    pattern = re.compile("^[a-zA-z]{5,13}$")
-    
-    #create a clean dictionary file
-    try:
-        with open("resources/dictionary-word-list.txt","w") as file :
-            for word in DICT_WORD_LIST :
-                if pattern.match(word):
-                    file.write(f"{word}\n")
-    except Exception :
-        raise Exception("exception raised")
-    logging.info("dictionary-word-list.txt file created successfully")
-
-clean_dict_list()
-
+import sys
+import threading
+import time
+from collections import OrderedDict
 # Load the words.txt file into memory when the module is imported
 # try:
 #     with open("resources/english.txt", "r") as file:
@@ -39,49 +13,215 @@ clean_dict_list()
 # except FileNotFoundError:
 #     raise FileNotFoundError("The words.txt file is missing in the resources folder.")
 
-try:
-    with open("resources/dictionary-word-list.txt", "r", encoding="utf-8") as file:
-        WORD_LIST = file.read().splitlines()
-except FileNotFoundError:
-    raise FileNotFoundError("The words.txt file is missing in the resources folder.")
+# The word list is downloaded and loaded on first use instead of at import,
+# so importing this module stays cheap and offline
+WORD_LIST = None
+_word_list_lock = threading.Lock()  # Only one thread per process loads the list
+
+DICTIONARY_URL = "https://raw.githubusercontent.com/meetDeveloper/freeDictionaryAPI/refs/heads/master/meta/wordList/english.txt"
+RAW_WORD_LIST_PATH = "resources/dictionary-raw-word-list.txt"
+WORD_LIST_PATH = "resources/dictionary-word-list.txt"
+# Seconds to wait for the dictionary sites before giving up
+DICTIONARY_TIMEOUT = float(os.getenv("DICTIONARY_TIMEOUT", "10"))
+# Seconds after a failed word list download before another one is attempted
+WORD_LIST_RETRY_SECONDS = float(os.getenv("WORD_LIST_RETRY_SECONDS", "300"))
+_word_list_failed_at = None
+
+def load_word_list():
+    """
+    Load the dictionary word list the first time it is needed, downloading and
+    cleaning it first if no process has done so yet.
+    """
+    global WORD_LIST, _word_list_failed_at
+    if WORD_LIST is None:
+        with _word_list_lock:
+            if WORD_LIST is None:
+                # Download only when no process has done it yet; the others read the existing file
+                if not os.path.exists(WORD_LIST_PATH):
+                    # Don't make every new game wait on a download that just failed
+                    if _word_list_failed_at is not None and time.monotonic() - _word_list_failed_at < WORD_LIST_RETRY_SECONDS:
+                        raise RuntimeError("The dictionary word list is unavailable, the last download failed")
+                    try:
+                        clean_dict_list()
+                    except requests.RequestException as e:
+                        # Fall back to a list another process finished in the meantime
+                        if not os.path.exists(WORD_LIST_PATH):
+                            _word_list_failed_at = time.monotonic()
+                            raise RuntimeError(f"Failed to download the dictionary word list: {e}") from e
+                        logging.warning(f"Failed to download the dictionary word list, using the existing file: {e}")
+                try:
+                    with open(WORD_LIST_PATH, "r", encoding="utf-8") as file:
+                        WORD_LIST = file.read().splitlines()
+                except FileNotFoundError:
+                    raise FileNotFoundError("The words.txt file is missing in the resources folder.")
+    return WORD_LIST
+
+# Per-length resources: built the first time a length is requested and
+# evicted, least recently used first, when they outgrow WORD_CACHE_MAX_MB.
+# The budget is checked after every build and whenever a definition is cached
+WORD_CACHE_MAX_MB = float(os.getenv("WORD_CACHE_MAX_MB", "64"))
+DEFINITION_CACHE_SIZE = int(os.getenv("DEFINITION_CACHE_SIZE", "1000"))
+# Lengths to build in the background at startup
+WARM_LENGTHS = [int(length) for length in os.getenv("WARM_LENGTHS", "5").split(",") if length]
+
+# Rough per-entry size of the definition cache, for the memory report
+_DEFINITION_ENTRY_BYTES = 400
+
+_resources = OrderedDict()  # length -> LengthResources, least recently used first
+_resources_lock = threading.Lock()  # Guards _resources only, never held while building
+_build_locks = {}  # length -> Lock, so each length is built once without blocking other lengths
+_definitions_lock = threading.Lock()
+
+
+class LengthResources:
+    """
+    Word index, validation set and definition cache for one word length.
+    The word list and set are shared by every game of this length and must not be modified.
+    """
+    def __init__(self, length):
+        started = time.perf_counter()
+        self.length = length
+        self.words = [
+            word.lower() for word in load_word_list()
+            if len(word) == length and word.isalpha() and word.isascii()
+        ]
+        self.valid_words = frozenset(self.words)
+        self.definitions = OrderedDict()  # word -> meaning
+        self.base_bytes = (
+            sys.getsizeof(self.words) + sys.getsizeof(self.valid_words)
+            + sum(sys.getsizeof(word) for word in self.words)
+        )
+        self.build_seconds = time.perf_counter() - started
+
+    def memory_bytes(self):
+        return (
+            self.base_bytes
+            + len(self.definitions) * _DEFINITION_ENTRY_BYTES
+        )
+
+
+def _evict(keep):
+    # Drop least recently used lengths until the cache fits its budget
+    budget = WORD_CACHE_MAX_MB * 1024 * 1024
+    while sum(resources.memory_bytes() for resources in _resources.values()) > budget:
+        length = next((length for length in _resources if length != keep), None)
+        if length is None:
+            break
+        evicted = _resources.pop(length)
+        logging.info(f"Evicted {length}-letter resources ({evicted.memory_bytes() / 1e6:.2f} MB)")
+
+
+def get_resources(length):
+    """
+    Return the resources for a word length, building them on first use.
+    """
+    with _resources_lock:
+        resources = _resources.get(length)
+        if resources is not None:
+            _resources.move_to_end(length)
+            return resources
+        build_lock = _build_locks.setdefault(length, threading.Lock())
+
+    with build_lock:
+        # Another thread may have finished building while we waited
+        with _resources_lock:
+            resources = _resources.get(length)
+            if resources is not None:
+                _resources.move_to_end(length)
+                return resources
+
+        resources = LengthResources(length)
+        logging.info(
+            f"Built {length}-letter resources: {len(resources.words)} words, "
+            f"{resources.memory_bytes() / 1e6:.2f} MB in {resources.build_seconds:.3f}s"
+        )
+        with _resources_lock:
+            _resources[length] = resources
+            _evict(keep=length)
+        return resources
+
+
+def warm_up(lengths=None):
+    """
+    Build the resources for the popular lengths ahead of the first game.
+    """
+    for length in WARM_LENGTHS if lengths is None else lengths:
+        get_resources(length)
+
+
+def resource_report():
+    """
+    Memory and build time of every length currently loaded.
+    """
+    with _resources_lock:
+        return [
+            {
+                "length": length,
+                "words": len(resources.words),
+                "memory_bytes": resources.memory_bytes(),
+                "build_seconds": resources.build_seconds,
+                "definitions_cached": len(resources.definitions),
+            }
+            for length, resources in sorted(_resources.items())
+        ]
 
 # Function to fetch word meaning
 def fetch_word_meaning(word):
     """
     Fetch the meaning of a word using the Free Dictionary API.
     """
-    response = requests.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}")
+    resources = _resources.get(len(word))
+    if resources is not None:
+        with _definitions_lock:
+            meaning = resources.definitions.get(word)
+        if meaning is not None:
+            return meaning
+
+    try:
+        response = requests.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}", timeout=DICTIONARY_TIMEOUT)
+    except requests.RequestException as e:
+        logging.warning(f"Failed to fetch the meaning of {word}: {e}")
+        return "No definition found."
     if response.status_code == 200:
         data = response.json()
-        return data[0]["meanings"][0]["definitions"][0]["definition"]
+        meaning = data[0]["meanings"][0]["definitions"][0]["definition"]
+        if resources is not None:
+            with _definitions_lock:
+                resources.definitions[word] = meaning
+                if len(resources.definitions) > DEFINITION_CACHE_SIZE:
+                    resources.definitions.popitem(last=False)
+            # The cache grew, so the budget may now be exceeded without any new length being built
+            with _resources_lock:
+                _evict(keep=len(word))
+        return meaning
     else:
         return "No definition found."
     
 def get_words_list(length):
     """
-    Filter the preloaded word list by length.
+    Return the words of the given length, shared between callers.
     """
-    # Filter words by length
-    filtered_words = [
-        word for word in WORD_LIST
-        if len(word) == length and word.isalpha() and word.isascii()
-    ]
-    return filtered_words
+    return get_resources(length).words
 
 def clean_dict_list():
 
     #fetching the word list from the dictionary api repo
 
-    response =requests.get("https://raw.githubusercontent.com/meetDeveloper/freeDictionaryAPI/refs/heads/master/meta/wordList/english.txt")
+    response =requests.get(DICTIONARY_URL, timeout=DICTIONARY_TIMEOUT)
+    response.raise_for_status()
+    os.makedirs("resources", exist_ok=True)
+    # Each file is written under a name of its own and moved into place, so
+    # other shard processes never read a half-written list
     try:
-        with open("resources/dictionary-raw-word-list.txt","wb") as file:
+        with open(f"{RAW_WORD_LIST_PATH}.{os.getpid()}.tmp","wb") as file:
             file.write(response.content)
+        os.replace(f"{RAW_WORD_LIST_PATH}.{os.getpid()}.tmp", RAW_WORD_LIST_PATH)
     except Exception:
         raise Exception("exception raised")
     logging.info("dictionary-raw-word-list.txt file created successfully")
     #remove the undesired words from the list 
     try:
-        with open("resources/dictionary-raw-word-list.txt","r") as file :
+        with open(RAW_WORD_LIST_PATH,"r", encoding="utf-8") as file :
             DICT_WORD_LIST = file.read().splitlines()
     except FileNotFoundError:
         raise FileNotFoundError("file dictionary-raw-word-list.txt not found")
@@ -89,10 +229,11 @@ def clean_dict_list():
     
     #create a clean dictionary file
     try:
-        with open("resources/dictionary-word-list.txt","w") as file :
+        with open(f"{WORD_LIST_PATH}.{os.getpid()}.tmp","w", encoding="utf-8") as file :
             for word in DICT_WORD_LIST :
                 if pattern.match(word):
                     file.write(f"{word}\n")
+        os.replace(f"{WORD_LIST_PATH}.{os.getpid()}.tmp", WORD_LIST_PATH)
     except Exception :
         raise Exception("exception raised")
-    logging.info("dictionary-word-list.txt file created successfully")
\ No newline at end of file
+    logging.info("dictionary-word-list.txt file created successfully")